@@ -338,8 +338,9 @@ class PDCAFlow(Flow[PDCAState]):
                 "metricas": sanitizar_input(state.plano_acao.metricas)
             }
             
-            # Executar a equipe de verificação
-            resultado = verificar_crew.crew().kickoff(inputs=input_data)
+            # Executar a equipe de verificação (entradas repetidas reaproveitam o resultado
+            # anterior; PDCA_VERIFICAR_CACHE=0 força uma nova verificação)
+            resultado_verificacao = verificar_crew.verificar(input_data)
             
             # Registrar informações sobre a execução para rastreabilidade
             state.fingerprints["verificar"] = {
@@ -348,7 +349,7 @@ class PDCAFlow(Flow[PDCAState]):
             }
             
             # Atualizar o estado com o resultado da verificação
-            state.resultado_verificacao = resultado.pydantic
+            state.resultado_verificacao = resultado_verificacao
             
             # Registrar evento de conclusão da fase
             state.registrar_evento("fase_verificar_concluida", {"resultado_verificacao": state.resultado_verificacao.dict()})
@@ -1,11 +1,28 @@
-from typing import Dict, List, Any, Optional, Type
+from typing import Dict, List, Any, Optional, Type, ClassVar
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
+import io
+import os
 import re
+import sys
 import json
 from datetime import datetime
-from collections import Counter
+import heapq
+from collections import deque
+from itertools import islice
+from operator import itemgetter
 from typing import Dict, List, Any, Optional
+# Níveis de gravidade reconhecidos e seu peso para o filtro
+_NIVEIS = {'DEBUG': 0, 'INFO': 1, 'WARNING': 2, 'ERROR': 3, 'CRITICAL': 4}
+# Timestamp em qualquer posição da linha, ex.: [2024-01-01 10:00:00]; o
+# formato fixo delimita a busca, sem retrocesso ao longo da linha
+_TS_RE = re.compile(r'\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\]')
+# Quantidade de eventos filtrados exibidos no relatório
+_MAX_EVENTOS = 30
+# Tamanho do bloco lido por vez do arquivo de log
+_TAMANHO_BLOCO = 65536
+# Tamanho médio estimado de uma linha, usado para ler a partir do fim
+_BYTES_POR_LINHA = 512
 """# Dicionário centralizado de descrições"""
 DESCRIPTIONS = {'LogAnalyzerParameters.caminho_arquivo':
     'Caminho para o arquivo de log a ser analisado',
@@ -14,7 +31,9 @@ DESCRIPTIONS = {'LogAnalyzerParameters.caminho_arquivo':
     'LogAnalyzerParameters.max_linhas':
     'Número máximo de linhas a processar',
     'LogAnalyzerParameters.formato_saida':
-    'Formato da saída (texto ou json)', 'LogAnalyzerTool.description':
+    'Formato da saída (texto ou json)', 'LogAnalyzerParameters.de_fim':
+    'Se verdadeiro, analisa as linhas finais do arquivo em vez das iniciais (posição estimada; números de linha relativos ao trecho lido)'
+    , 'LogAnalyzerTool.description':
     'Ferramenta para análise de arquivos de log, identificando erros, avisos e padrões de uso.'
     }
 """# Função para obter descrições do dicionário local"""
@@ -25,6 +44,28 @@ def get_description(key: str) ->str:
     return DESCRIPTIONS.get(key, f'Descrição para {key} não encontrada')
 
 
+def _ler_linhas(arquivo, tamanho_bloco: int=_TAMANHO_BLOCO):
+    """Lê o arquivo em blocos e produz suas linhas, sem o '\\n' final."""
+    resto = ''
+    while True:
+        bloco = arquivo.read(tamanho_bloco)
+        if not bloco:
+            break
+        linhas = (resto + bloco).split('\n')
+        resto = linhas.pop()
+        yield from linhas
+    if resto:
+        yield resto
+
+
+def _posicionar_no_fim(arquivo, max_linhas: int):
+    """Posiciona o arquivo binário perto do fim, descartando a linha parcial."""
+    inicio = os.fstat(arquivo.fileno()).st_size - max_linhas * _BYTES_POR_LINHA
+    if inicio > 0:
+        arquivo.seek(inicio - 1)
+        arquivo.readline()
+
+
 class LogAnalyzerParameters(BaseModel):
     """Parâmetros para a ferramenta LogAnalyzer."""
     caminho_arquivo: str = Field(..., description=
@@ -36,6 +77,9 @@ class LogAnalyzerParameters(BaseModel):
         'Número máximo de linhas a processar', default=1000)
     formato_saida: str = Field(description=
         'Formato da saída (texto ou json)', default='texto')
+    de_fim: bool = Field(description=
+        'Se verdadeiro, analisa as linhas finais do arquivo em vez das iniciais (posição estimada; números de linha relativos ao trecho lido)'
+        , default=False)
 
 
 class LogAnalyzerTool(BaseTool):
@@ -45,95 +89,143 @@ class LogAnalyzerTool(BaseTool):
     name: str = 'LogAnalyzer'
     description: str = get_description('LogAnalyzerTool.description')
     args_schema: Type[BaseModel] = LogAnalyzerParameters
+    _niveis: ClassVar[Dict[str, int]] = _NIVEIS
+    _ts_re: ClassVar[re.Pattern] = _TS_RE
 
     def processar_arquivo_log(self, caminho_arquivo, nivel_gravidade,
-        max_linhas, formato_saida):
+        max_linhas, formato_saida, de_fim=False):
         """Processa um arquivo de log e retorna um relatório detalhado."""
-        NIVEIS_GRAVIDADE = {'DEBUG': 0, 'INFO': 1, 'WARNING': 2, 'ERROR': 3,
-            'CRITICAL': 4}
-        nivel_min = NIVEIS_GRAVIDADE.get(nivel_gravidade.upper(), 2)
+        niveis = self._niveis
+        # Referências locais evitam buscas de atributo a cada linha
+        valor_nivel = niveis.get
+        ts_search = self._ts_re.search
+        strptime = datetime.strptime
+        intern = sys.intern
+        nivel_min = valor_nivel(nivel_gravidade.upper(), 2)
+        # A varredura é limitada a 10.000 linhas; com esse teto o custo de
+        # criar processos supera o da leitura, por isso ela é sequencial.
         max_linhas = min(max(1, max_linhas), 10000)
         total_linhas = 0
         total_erros = 0
         total_avisos = 0
-        padrao_data = re.compile(
-            '\\[(\\d{4}-\\d{2}-\\d{2} \\d{2}:\\d{2}:\\d{2})\\]')
         ocorrencias_por_hora = {}
-        mensagens_comuns = Counter()
+        # Cache timestamp -> hora ('' para timestamps inválidos)
+        horas_por_timestamp = {}
+        # Linhas consecutivas costumam cair na mesma hora: conta a sequência
+        # atual em um inteiro e só atualiza o dicionário quando a hora muda
+        hora_atual = ''
+        contagem_hora = 0
+        mensagens_comuns = {}
+        contagem_mensagem = mensagens_comuns.get
         eventos_filtrados = []
         try:
-            with open(caminho_arquivo, 'r', encoding='utf-8') as arquivo:
-                for i, linha in enumerate(arquivo):
-                    if i >= max_linhas:
-                        break
+            with open(caminho_arquivo, 'rb') as bruto:
+                if de_fim:
+                    _posicionar_no_fim(bruto, max_linhas)
+                arquivo = io.TextIOWrapper(bruto, encoding='utf-8')
+                if de_fim:
+                    # A janela lida é estimada; só as últimas linhas dela
+                    # correspondem ao fim do arquivo
+                    linhas = deque(_ler_linhas(arquivo), maxlen=max_linhas)
+                else:
+                    linhas = islice(_ler_linhas(arquivo), max_linhas)
+                for i, linha in enumerate(linhas):
                     total_linhas += 1
-                    nivel_linha = None
-                    for nivel in NIVEIS_GRAVIDADE:
-                        if nivel in linha.upper():
-                            nivel_linha = nivel
-                            nivel_valor = NIVEIS_GRAVIDADE[nivel]
-                            if nivel_valor == 3:
-                                total_erros += 1
-                            elif nivel_valor == 2:
-                                total_avisos += 1
-                            break
-                    if nivel_linha and NIVEIS_GRAVIDADE.get(nivel_linha, 0
-                        ) >= nivel_min:
-                        match_data = padrao_data.search(linha)
+                    # Caminho rápido: nível logo após o timestamp,
+                    # ex.: "[2024-01-01 10:00:00] ERROR mensagem"
+                    inicio = linha.find('] ') + 2
+                    if inicio > 1:
+                        nivel_linha = linha[inicio:linha.find(' ', inicio)]
+                        nivel_valor = valor_nivel(nivel_linha)
+                    else:
+                        nivel_valor = None
+                    if nivel_valor is None:
+                        nivel_linha = None
+                        linha_upper = linha.upper()
+                        for nivel in niveis:
+                            if nivel in linha_upper:
+                                nivel_linha = nivel
+                                nivel_valor = niveis[nivel]
+                                break
+                    if nivel_valor == 3:
+                        total_erros += 1
+                    elif nivel_valor == 2:
+                        total_avisos += 1
+                    if nivel_linha and nivel_valor >= nivel_min:
+                        match_data = ts_search(linha)
                         if match_data:
                             data_str = match_data.group(1)
-                            try:
-                                data = datetime.strptime(data_str,
-                                    '%Y-%m-%d %H:%M:%S')
-                                hora = data.strftime('%Y-%m-%d %H')
-                                ocorrencias_por_hora[hora
-                                    ] = ocorrencias_por_hora.get(hora, 0) + 1
-                            except ValueError:
-                                pass
-                        mensagem = linha.strip()
-                        if len(mensagem) > 50:
-                            mensagem = mensagem[:47] + '...'
-                        mensagens_comuns[mensagem] += 1
-                        eventos_filtrados.append({'nivel': nivel_linha,
-                            'linha': i + 1, 'mensagem': linha.strip()})
-            resumo = {'arquivo': caminho_arquivo, 'total_linhas_lidas':
-                total_linhas, 'total_erros': total_erros, 'total_avisos':
-                total_avisos, 'nivel_filtro': nivel_gravidade,
-                'distribuicao_temporal': dict(sorted(ocorrencias_por_hora.
-                items())), 'mensagens_mais_comuns': dict(mensagens_comuns.
-                most_common(5)), 'eventos_filtrados': eventos_filtrados[:30]}
-            if formato_saida.lower() == 'json':
-                return json.dumps(resumo, indent=2)
-            else:
-                return self.formatar_relatorio_texto(resumo)
-        except Exception as e:
+                            hora = horas_por_timestamp.get(data_str)
+                            if hora is None:
+                                try:
+                                    hora = strptime(data_str,
+                                        '%Y-%m-%d %H:%M:%S').strftime(
+                                        '%Y-%m-%d %H')
+                                except ValueError:
+                                    hora = ''
+                                horas_por_timestamp[data_str] = hora
+                            if hora:
+                                if hora != hora_atual:
+                                    if contagem_hora:
+                                        ocorrencias_por_hora[hora_atual
+                                            ] = ocorrencias_por_hora.get(
+                                            hora_atual, 0) + contagem_hora
+                                    hora_atual = hora
+                                    contagem_hora = 0
+                                contagem_hora += 1
+                        texto = linha.strip()
+                        if len(texto) > 50:
+                            mensagem = intern(texto[:47] + '...')
+                        else:
+                            mensagem = intern(texto)
+                        mensagens_comuns[mensagem] = contagem_mensagem(
+                            mensagem, 0) + 1
+                        if len(eventos_filtrados) < _MAX_EVENTOS:
+                            eventos_filtrados.append({'nivel': nivel_linha,
+                                'linha': i + 1, 'mensagem': texto})
+        except (OSError, UnicodeDecodeError) as e:
             return {'erro': f'Erro ao processar arquivo de log: {repr(e)}'}
+        if contagem_hora:
+            ocorrencias_por_hora[hora_atual] = ocorrencias_por_hora.get(
+                hora_atual, 0) + contagem_hora
+        resumo = {'arquivo': caminho_arquivo, 'total_linhas_lidas':
+            total_linhas, 'total_erros': total_erros, 'total_avisos':
+            total_avisos, 'nivel_filtro': nivel_gravidade,
+            'distribuicao_temporal': dict(sorted(ocorrencias_por_hora.
+            items())), 'mensagens_mais_comuns': dict(heapq.nlargest(5,
+            mensagens_comuns.items(), key=itemgetter(1))),
+            'eventos_filtrados': eventos_filtrados}
+        if formato_saida.lower() == 'json':
+            return json.dumps(resumo, indent=2, ensure_ascii=False)
+        else:
+            return self.formatar_relatorio_texto(resumo)
 
     def formatar_relatorio_texto(self, resumo):
         """Formata o relatório de análise de log em formato textual estruturado."""
-        saida = f'## Relatório de Análise de Log\n\n'
-        saida += f"**Arquivo:** {resumo['arquivo']}\n"
-        saida += f"**Linhas lidas:** {resumo['total_linhas_lidas']}\n"
-        saida += f"**Erros encontrados:** {resumo['total_erros']}\n"
-        saida += f"**Avisos encontrados:** {resumo['total_avisos']}\n"
-        saida += f"**Nível de filtro aplicado:** {resumo['nivel_filtro']}\n\n"
-        saida += '### Distribuição Temporal\n\n'
+        partes = [
+            '## Relatório de Análise de Log\n\n'
+            f"**Arquivo:** {resumo['arquivo']}\n"
+            f"**Linhas lidas:** {resumo['total_linhas_lidas']}\n"
+            f"**Erros encontrados:** {resumo['total_erros']}\n"
+            f"**Avisos encontrados:** {resumo['total_avisos']}\n"
+            f"**Nível de filtro aplicado:** {resumo['nivel_filtro']}\n\n"
+            '### Distribuição Temporal\n\n']
         for hora, contagem in resumo['distribuicao_temporal'].items():
-            saida += f'- {hora}h: {contagem} ocorrências\n'
-        saida += '\n### Mensagens Mais Comuns\n\n'
+            partes.append(f'- {hora}h: {contagem} ocorrências\n')
+        partes.append('\n### Mensagens Mais Comuns\n\n')
         for msg, contagem in resumo['mensagens_mais_comuns'].items():
-            saida += f'- ({contagem}x) {msg}\n'
-        saida += '\n### Eventos Filtrados (Primeiros 30)\n\n'
+            partes.append(f'- ({contagem}x) {msg}\n')
+        partes.append('\n### Eventos Filtrados (Primeiros 30)\n\n')
         for evento in resumo['eventos_filtrados']:
-            saida += (
+            partes.append(
                 f"[{evento['nivel']}] Linha {evento['linha']}: {evento['mensagem'][:100]}\n"
                 )
-        return saida
+        return ''.join(partes)
 
     def _run(self, caminho_arquivo: str, nivel_gravidade: str='WARNING',
-        max_linhas: int=1000, formato_saida: str='texto'):
+        max_linhas: int=1000, formato_saida: str='texto', de_fim: bool=False):
         return self.processar_arquivo_log(caminho_arquivo, nivel_gravidade,
-            max_linhas, formato_saida)
+            max_linhas, formato_saida, de_fim)
 
 
 if __name__ == '__main__':
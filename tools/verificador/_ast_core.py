@@ -0,0 +1,464 @@
+#!/usr/bin/env python
+"""
+Núcleo estático do verificador de ferramentas.
+
+Reúne a análise via AST (sintaxe, classe da ferramenta, método '_run' e
+atributos obrigatórios) usando apenas a biblioteca padrão, sem importar
+crewai nem pydantic. É usado por tool_verifier e pode ser executado
+diretamente para um diagnóstico rápido:
+
+    python crews/pdca/tools/verificador/_ast_core.py <caminho_para_arquivo_da_ferramenta.py>
+"""
+
+import ast
+import os
+import traceback
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Union
+
+
+# Atributos de classe obrigatórios, na ordem em que são reportados, e o bit
+# que marca cada um deles como encontrado na AST
+_REQUIRED_ATTRS = ('name', 'description', 'args_schema')
+_BITS_ATRIBUTOS = {nome: 1 << i for i, nome in enumerate(_REQUIRED_ATTRS)}
+
+
+# Mensagens detalhadas da verificação AST; '{cls}' é o nome da classe
+_SEPARADOR = "-" * 20
+_TEMPLATE_HERANCA = (
+    "AVISO DE HERANÇA\n"
+    f"{_SEPARADOR}\n"
+    "Classe: {cls}\n"
+    "Problema: Não herda diretamente de 'BaseTool'\n"
+    "Ação: Verifique se a classe herda corretamente de 'BaseTool'\n"
+    "Exemplo:\n"
+    "class MinhaFerramenta(BaseTool):\n"
+    "    ..."
+)
+_TEMPLATE_SEM_RUN = (
+    "ERRO NO MÉTODO _run\n"
+    f"{_SEPARADOR}\n"
+    "Classe: {cls}\n"
+    "Problema: Método '_run' não encontrado\n"
+    "Ação: Adicione o método '_run' à classe\n"
+    "Exemplo:\n"
+    "    def _run(self, param1: str, param2: int = 0) -> dict:\n"
+    "        return {{'resultado': 'processado'}}"
+)
+_MSG_SEM_CLASSE = (
+    "ERRO NA ESTRUTURA DA CLASSE\n"
+    f"{_SEPARADOR}\n"
+    "Problema: Nenhuma classe terminando com 'Tool' foi encontrada\n"
+    "Ação: Crie uma classe que herde de BaseTool e termine com 'Tool'\n"
+    "Exemplo:\n"
+    "class MinhaFerramenta(BaseTool):\n"
+    "    name = 'Minha Ferramenta'\n"
+    "    description = 'Descrição da ferramenta'"
+)
+
+
+# Mensagens informativas fixas, já com o prefixo usado por add_info
+_INFO_ANALISANDO_AST = "INFO: Analisando AST para erros de sintaxe e estrutura"
+_INFO_SINTAXE_OK = "INFO: Sintaxe do arquivo Python válida"
+_INFO_HERANCA_OK = "INFO: Herança de BaseTool verificada na AST."
+_INFO_RUN_AST_OK = "INFO: Método '_run' encontrado na AST."
+_INFO_CONCLUIDA_OK = "INFO: Verificação concluída sem erros ou avisos críticos."
+
+
+# Tipos de nó da AST comparados com 'type(x) is': são classes folha, então
+# a comparação direta equivale ao isinstance e dispensa percorrer o MRO
+_AnnAssign = ast.AnnAssign
+_Assign = ast.Assign
+_Name = ast.Name
+_ClassDef = ast.ClassDef
+_FunctionDef = ast.FunctionDef
+_Constant = ast.Constant
+
+
+# Mapeamento de componentes para parâmetros do DynamicToolCreator
+MAPEAMENTO_COMPONENTES = {
+    'Método _run': 'implementação do método _run',
+    'Atributos da Classe': 'definição dos atributos da classe',
+    'Schema de Entrada': 'definição dos parâmetros',
+    'Herança de Classe': 'estrutura da classe',
+    'Estrutura Python': 'sintaxe Python',
+    'Imports': 'importações',
+    'Métodos Customizados': 'métodos personalizados'
+}
+
+
+def _formatar_excecao(e: BaseException) -> str:
+    """Descreve a exceção em uma linha; com PDCA_DEBUG inclui o traceback completo."""
+    if os.environ.get("PDCA_DEBUG"):
+        return f"{e}\n{traceback.format_exc()}"
+    return ''.join(traceback.format_exception_only(type(e), e)).rstrip()
+
+
+@dataclass(slots=True)
+class _ToolAnalysisResult:
+    """Classe interna para armazenar os resultados da análise."""
+    tool_path: Path
+    errors: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    info: List[str] = field(default_factory=list)
+    tool_class_name: Optional[str] = None
+    tool_class: Optional[type] = None  # subclasse de BaseTool, após a importação
+    ast_tree: Optional[ast.AST] = None
+    module: Optional[Any] = None
+    found_args_schema_name: Optional[str] = None
+    tool_instance: Optional[Any] = None
+    error_components: set[str] = field(default_factory=set)
+    found_attr_flags: int = 0  # bits de _BITS_ATRIBUTOS
+    class_attr_values: Dict[str, Any] = field(default_factory=dict)
+    mtime_ns: Optional[int] = None
+    file_size: Optional[int] = None
+
+    def __post_init__(self):
+        self.tool_path = Path(self.tool_path)
+
+    def add_error(self, message: str, component: str = None):
+        """Adiciona uma mensagem de erro com contexto do componente."""
+        if component:
+            self.error_components.add(component)
+            error_msg = f"ERRO NO COMPONENTE: {component}\n"
+            error_msg += "-" * 40 + "\n"
+            error_msg += f"Problema: {message}"
+            self.errors.append(error_msg)
+        else:
+            self.errors.append(f"ERRO: {message}")
+
+    def add_warning(self, message: str, component: str = None):
+        """Adiciona uma mensagem de aviso com contexto do componente."""
+        if component:
+            warning_msg = f"AVISO NO COMPONENTE: {component}\n"
+            warning_msg += "-" * 40 + "\n"
+            warning_msg += f"Atenção: {message}\n"
+            self.warnings.append(warning_msg)
+        else:
+            self.warnings.append(f"AVISO: {message}")
+
+    def add_info(self, message: str):
+        """Adiciona uma mensagem informativa (apenas para debug)."""
+        self.info.append(f"INFO: {message}")
+
+    def add_info_const(self, message: str):
+        """Adiciona uma mensagem informativa que já inclui o prefixo 'INFO: '."""
+        self.info.append(message)
+
+    def _format_report(self) -> str:
+        """Formata os resultados em um relatório textual.
+           Mantido para possível log interno, mas não será o retorno principal.
+        """
+        report_lines = [f"## Relatório de Verificação: {self.tool_path.name}"]
+
+        if not self.errors and not self.warnings:
+            status_header = "**Status: APROVADO (com ressalvas)**"
+            status_desc = ["   A verificação estática e de importação foi concluída sem erros ou avisos críticos.",
+                           "   A instanciação não foi testada ou falhou (ver avisos), mas a estrutura parece válida."]
+        elif not self.errors:
+            status_header = "**Status: APROVADO COM AVISOS**"
+            status_desc = ["   A ferramenta passou nas verificações essenciais, mas há avisos a serem considerados."]
+        else:
+            status_header = "**Status: FALHA**"
+            status_desc = ["   Foram encontrados erros críticos que impedem o uso seguro da ferramenta."]
+
+        report_lines.append(status_header)
+        report_lines.extend(status_desc)
+
+        if self.tool_class_name:
+            report_lines.append(f"**Classe da Ferramenta Identificada:** `{self.tool_class_name}`")
+        else:
+            report_lines.append("**Classe da Ferramenta:** Nenhuma classe terminando com 'Tool' foi encontrada.")
+
+        if self.info:
+            report_lines.append("### Informações:")
+            report_lines.extend(self.info)
+
+        if self.warnings:
+            report_lines.append("### Avisos:")
+            report_lines.extend(self.warnings)
+
+        if self.errors:
+            report_lines.append("### Erros Críticos:")
+            report_lines.extend(self.errors)
+
+        report_lines.append("### Próximos Passos:")
+        if not self.errors:
+            report_lines.extend([
+                "- Revise os avisos (se houver).",
+                "- Realize testes funcionais da ferramenta com dados reais.",
+                "- Se a instanciação falhou (ver avisos), investigue possíveis problemas de inicialização ou dependências."
+            ])
+        else:
+            report_lines.extend([
+                "- Corrija os erros críticos listados.",
+                "- Execute a verificação novamente após as correções."
+            ])
+
+        return "\n".join(report_lines)
+
+
+class _FimDaVarredura(Exception):
+    """Interrompe a varredura da AST assim que a classe da ferramenta é analisada."""
+
+
+class _ToolAstScanner(ast.NodeVisitor):
+    """Percorre a AST uma única vez coletando os dados da classe da ferramenta.
+
+    Localiza a primeira classe cujo nome termina com 'Tool' (classes no nível
+    do módulo têm prioridade) e registra suas bases, a presença de '_run' e
+    os atributos de classe obrigatórios declarados (e seus valores, quando
+    são literais).
+    """
+    def __init__(self):
+        self.tool_class_name: Optional[str] = None
+        self.base_names: List[str] = []
+        self.has_run = False
+        self.attr_flags = 0
+        self.attr_values: Dict[str, Any] = {}
+
+    def scan(self, tree: ast.AST) -> "_ToolAstScanner":
+        """Executa a varredura e retorna o próprio scanner."""
+        try:
+            self.visit(tree)
+        except _FimDaVarredura:
+            pass
+        return self
+
+    def visit_Module(self, node: ast.Module):
+        for item in node.body:
+            if type(item) is _ClassDef and item.name.endswith("Tool"):
+                self._analisar_classe(item)
+        self.generic_visit(node)
+
+    def visit_ClassDef(self, node: ast.ClassDef):
+        if node.name.endswith("Tool"):
+            self._analisar_classe(node)
+        self.generic_visit(node)
+
+    def _analisar_classe(self, node: ast.ClassDef):
+        self.tool_class_name = node.name
+        self.base_names = [b.id for b in node.bases if type(b) is _Name]
+        for item in node.body:
+            if type(item) is _FunctionDef:
+                if item.name == '_run':
+                    self.has_run = True
+            elif type(item) is _AnnAssign:
+                if type(item.target) is _Name and item.target.id in _BITS_ATRIBUTOS:
+                    self._registrar_atributo(item.target.id, item.value)
+            elif type(item) is _Assign:
+                for target in item.targets:
+                    if type(target) is _Name and target.id in _BITS_ATRIBUTOS:
+                        self._registrar_atributo(target.id, item.value)
+        raise _FimDaVarredura
+
+    def _registrar_atributo(self, nome: str, valor: Optional[ast.AST]):
+        self.attr_flags |= _BITS_ATRIBUTOS[nome]
+        if type(valor) is _Constant:
+            self.attr_values[nome] = valor.value
+
+
+def _build_result_dict(res: _ToolAnalysisResult) -> Dict[str, Any]:
+    """Constrói o dicionário de resultados final."""
+    return {
+        "sucesso": not res.errors, # Sucesso significa sem erros críticos
+        "erros": res.errors,
+        "avisos": res.warnings,
+        "infos": res.info,
+        "tool_path": str(res.tool_path),
+        "tool_class_name": res.tool_class_name
+    }
+
+
+def _verify_ast(res: _ToolAnalysisResult) -> bool:
+    """Verifica erros de sintaxe e estrutura básica via AST."""
+    res.add_info_const(_INFO_ANALISANDO_AST)
+    try:
+        # Leitura direta do descritor: evita as camadas de TextIOWrapper
+        fd = os.open(res.tool_path, os.O_RDONLY)
+        try:
+            tamanho = res.file_size if res.file_size is not None else os.fstat(fd).st_size
+            source_code = os.read(fd, tamanho).decode('utf-8')
+        finally:
+            os.close(fd)
+        # Normaliza as quebras de linha como o modo texto fazia: com '\r'
+        # isolado, o parser conta linhas que o split('\n') abaixo não teria
+        if '\r' in source_code:
+            source_code = source_code.replace('\r\n', '\n').replace('\r', '\n')
+        res.ast_tree = ast.parse(source_code, filename=str(res.tool_path), type_comments=False)
+        res.add_info_const(_INFO_SINTAXE_OK)
+    except SyntaxError as e:
+        # Extrair contexto do erro
+        # Separado por '\n' (e não splitlines) para manter a numeração do
+        # parser, que não trata \f e afins como quebra de linha
+        linhas = source_code.split('\n')
+        inicio = max(0, e.lineno - 3)
+        fim = min(len(linhas), e.lineno + 2)
+        contexto = linhas[inicio:fim]
+
+        # Identificar o componente com erro
+        componente = _identificar_componente_com_erro(linhas, e.lineno)
+
+        componente_nome, componente_descricao = componente
+
+        # Mensagem de erro extremamente simplificada
+        parte1 = f"Erro de sintaxe na linha {e.lineno}: {e.msg}"
+        parte2 = f"Componente: {componente_nome}"
+
+        # Criar mensagem em partes para evitar problemas de formatação
+        res.add_error(parte1)
+        res.add_error(parte2)
+
+        # Adicionar contexto da linha com erro de forma segura
+        if contexto and 0 <= e.lineno - inicio - 1 < len(contexto):
+            linha_com_erro = contexto[e.lineno - inicio - 1].strip()
+            if len(linha_com_erro) > 30:  # Limitar o tamanho da linha
+                linha_com_erro = linha_com_erro[:27] + "..."
+            res.add_error(f"Código: {linha_com_erro}")
+
+            # Adicionar sugestão de correção com base no erro
+            if e.msg == "expected ':'":
+                res.add_error("Sugestão: Adicione dois pontos (:) ao final da linha")
+            elif "unexpected EOF" in e.msg:
+                res.add_error("Sugestão: Verifique parênteses/colchetes não fechados")
+            elif "unexpected indent" in e.msg:
+                res.add_error("Sugestão: Corrija a indentação da linha")
+            else:
+                res.add_error("Sugestão: Verifique a sintaxe Python na linha")
+
+        return False
+    except Exception as e:
+        res.add_error(f"Erro ao ler ou parsear o arquivo: {_formatar_excecao(e)}")
+        return False
+
+    # Procurar classe da ferramenta na AST (uma única varredura)
+    scanner = _ToolAstScanner().scan(res.ast_tree)
+    found_tool_class_ast = scanner.tool_class_name is not None
+    if found_tool_class_ast:
+        res.tool_class_name = scanner.tool_class_name
+        res.found_attr_flags = scanner.attr_flags
+        res.class_attr_values = scanner.attr_values
+        res.add_info(f"Classe AST encontrada: {scanner.tool_class_name}")
+
+        # Verificar herança básica
+        if "BaseTool" not in scanner.base_names:
+            res.add_warning(_TEMPLATE_HERANCA.format(cls=scanner.tool_class_name))
+        else:
+            res.add_info_const(_INFO_HERANCA_OK)
+
+        # Verificar método _run
+        if not scanner.has_run:
+            res.add_error(_TEMPLATE_SEM_RUN.format(cls=scanner.tool_class_name))
+        else:
+            res.add_info_const(_INFO_RUN_AST_OK)
+
+    if not found_tool_class_ast:
+        res.add_error(_MSG_SEM_CLASSE)
+        return False
+
+    return True
+
+
+def _identificar_componente_com_erro(linhas: List[str], linha_erro: int) -> tuple[str, str]:
+    """Identifica em qual componente da ferramenta o erro ocorreu.
+
+    Args:
+        linhas: Linhas do código fonte (já separadas por '\n')
+        linha_erro: Número da linha onde o erro ocorreu
+
+    Returns:
+        Tupla com (nome do componente, parâmetro do DynamicToolCreator)
+        Ex: ('Método _run', 'implementation')
+    """
+    linha_atual = linha_erro - 1  # 0-based index
+
+    # Procura por padrões comuns acima da linha de erro
+    linha_atual_str = linhas[linha_atual].strip()
+    linha_lower = linha_atual_str.lower()
+    # Janela de linhas em torno do erro, montada uma única vez
+    janela = '\n'.join(linhas[max(0, linha_atual-5):linha_atual+5])
+
+    # Verifica componentes comuns. A linha atual faz parte da janela, então
+    # a partir do segundo teste já se sabe que ela não contém '_run'; e
+    # 'Tool' cobre 'BaseTool'.
+    if '_run' in janela:
+        componente = 'Método _run'
+    elif 'class' in linha_atual_str and 'Tool' in linha_atual_str:
+        componente = 'Herança de Classe'
+    elif 'BaseModel' in linha_atual_str or 'Field(' in janela:
+        componente = 'Schema de Entrada'
+    elif any(attr in linha_atual_str for attr in _REQUIRED_ATTRS):
+        componente = 'Atributos da Classe'
+    elif 'import' in linha_lower or 'from' in linha_lower:
+        componente = 'Imports'
+    elif 'def' in linha_atual_str:
+        componente = 'Métodos Customizados'
+    else:
+        componente = 'Estrutura Python'
+
+    return (componente, MAPEAMENTO_COMPONENTES[componente])
+
+
+def _verify_static_attributes(res: _ToolAnalysisResult):
+    """Verifica via AST os atributos de classe obrigatórios (modo static_only)."""
+    for attr in _REQUIRED_ATTRS:
+        if not res.found_attr_flags & _BITS_ATRIBUTOS[attr]:
+            res.add_warning(f"Atributo de classe '{attr}' não detectado estaticamente via AST.")
+        elif attr != 'args_schema' and not isinstance(res.class_attr_values.get(attr, ''), str):
+            res.add_error(f"Atributo '{attr}' da classe '{res.tool_class_name}' não é uma string.")
+        else:
+            res.add_info(f"Atributo de classe '{attr}' encontrado na AST.")
+
+
+def _finalizar_verificacao(res: _ToolAnalysisResult):
+    """Registra o resumo final da verificação."""
+    if not res.errors and not res.warnings:
+        res.add_info_const(_INFO_CONCLUIDA_OK)
+    elif not res.errors:
+        res.add_warning("Verificação concluída com avisos.")
+    else:
+        res.add_error("Verificação concluída com erros críticos.")
+
+    res.add_info(f"Verificação finalizada para: {res.tool_path}")
+
+
+def _checar_arquivo(res: _ToolAnalysisResult) -> bool:
+    """Confere se o caminho aponta para um arquivo .py existente."""
+    if not res.tool_path.exists():
+        res.add_error(f"Arquivo não encontrado: {res.tool_path}")
+        return False
+    if not res.tool_path.is_file() or res.tool_path.suffix != '.py':
+        res.add_error(f"O caminho fornecido não é um arquivo .py válido: {res.tool_path}")
+        return False
+    return True
+
+
+def verificar_ast(tool_path: Union[str, Path]) -> Dict[str, Any]:
+    """Verifica um arquivo apenas pela AST, sem importar a ferramenta."""
+    res = _ToolAnalysisResult(tool_path)
+    res.add_info(f"Iniciando verificação para: {res.tool_path}")
+    if not _checar_arquivo(res):
+        return _build_result_dict(res)
+    stat = res.tool_path.stat()
+    res.mtime_ns = stat.st_mtime_ns
+    res.file_size = stat.st_size
+    if not _verify_ast(res):
+        return _build_result_dict(res)  # Erro crítico na AST impede continuação
+    _verify_static_attributes(res)
+    _finalizar_verificacao(res)
+    return _build_result_dict(res)
+
+
+# Bloco para execução direta, sem as dependências do CrewAI
+if __name__ == "__main__":
+    import json
+    import sys
+
+    if len(sys.argv) > 1:
+        resultado = verificar_ast(sys.argv[1])
+        print(json.dumps(resultado, indent=4, ensure_ascii=False))
+        sys.exit(0 if resultado["sucesso"] else 1)
+    else:
+        print("Uso: python crews/pdca/tools/verificador/_ast_core.py <caminho_para_arquivo_da_ferramenta.py>")
+        sys.exit(2)
@@ -7,114 +7,100 @@ arquivos .py contendo ferramentas customizadas, focando na compatibilidade
 com o framework CrewAI e identificando problemas potenciais antes da execução.
 """
 
-import ast
+import contextlib
 import importlib.util
 import inspect
+import re
 import sys
-import traceback
-from pathlib import Path
-from typing import Dict, Any, List, Type, Optional, Union
+import weakref
+from collections import OrderedDict
+from typing import Dict, Any, List, Type, Optional, Tuple
 
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
+# A análise estática fica em um módulo sem dependências do CrewAI
+try:
+    from ._ast_core import (MAPEAMENTO_COMPONENTES, _ToolAnalysisResult, _ToolAstScanner,
+                            _formatar_excecao, _build_result_dict, _verify_ast,
+                            _identificar_componente_com_erro, _verify_static_attributes,
+                            _checar_arquivo, _finalizar_verificacao, verificar_ast)
+except ImportError:
+    # Execução direta do arquivo, fora do pacote
+    from _ast_core import (MAPEAMENTO_COMPONENTES, _ToolAnalysisResult, _ToolAstScanner,
+                           _formatar_excecao, _build_result_dict, _verify_ast,
+                           _identificar_componente_com_erro, _verify_static_attributes,
+                           _checar_arquivo, _finalizar_verificacao, verificar_ast)
+
+
+# Mensagens informativas fixas, já com o prefixo usado por add_info
+_INFO_STATIC_ONLY = "INFO: Verificações de importação e instância puladas (modo static_only)."
+_INFO_MODULO_IMPORTADO = "INFO: Módulo importado com sucesso."
+_INFO_MODULO_REUTILIZADO = "INFO: Módulo reutilizado de uma importação anterior (arquivo inalterado)."
+_INFO_RUN_INSPECAO_OK = "INFO: Método '_run' encontrado e chamável via inspeção."
+_INFO_INSTANCIACAO_PULADA = "INFO: Instanciação pulada devido a classe não carregada."
+_INFO_INSTANCIA_OK = "INFO: Instanciação da ferramenta bem-sucedida."
+_INFO_DESCRIPTION_OK = "INFO: Atributo 'description' encontrado na instância."
+
+
+# Cache de verificações bem-sucedidas, indexado por (caminho, mtime_ns, tamanho,
+# static_only).
+# Uma alteração no arquivo muda a chave e invalida a entrada implicitamente.
+# Resultados com erros não são guardados: muitas vezes dependem do ambiente
+# (ex.: dependência ausente) e podem mudar sem que o arquivo seja alterado.
+_CACHE_VERIFICACOES: "OrderedDict[Tuple[str, int, int, bool], Dict[str, Any]]" = OrderedDict()
+_CACHE_VERIFICACOES_MAX = 256
+
+
+# Módulos de ferramentas já importados: caminho resolvido -> nome em sys.modules.
+# O nome inclui o mtime do arquivo, então uma edição força nova importação.
+_MODULOS_VERIFICADOS: Dict[str, str] = {}
+
+
+# JSON schema já gerado por classe de args_schema. As chaves são fracas: quando
+# o módulo da ferramenta é descartado, a classe e a entrada somem juntas.
+_JSON_SCHEMA_CACHE: "weakref.WeakKeyDictionary[type, Dict[str, Any]]" = weakref.WeakKeyDictionary()
+
+
+def _json_schema(args_schema: Type[BaseModel]) -> Dict[str, Any]:
+    """Retorna model_json_schema() do modelo, reaproveitando o resultado já gerado."""
+    try:
+        schema = _JSON_SCHEMA_CACHE.get(args_schema)
+    except TypeError:  # classe sem suporte a weakref ou não hasheável
+        return args_schema.model_json_schema()
+    if schema is None:
+        schema = args_schema.model_json_schema()
+        _JSON_SCHEMA_CACHE[args_schema] = schema
+    return schema
+
+
+def _nome_modulo_em_cache(caminho: str, mtime_ns: int, tamanho: int) -> str:
+    """Nome sob o qual o módulo da ferramenta é registrado em sys.modules."""
+    return "_toolverifier_" + re.sub(r'\W', '_', f"{caminho}_{mtime_ns}_{tamanho}")
+
+
+@contextlib.contextmanager
+def _syspath_prepend(caminho: str):
+    """Coloca 'caminho' no início do sys.path enquanto o bloco executa."""
+    sys.path.insert(0, caminho)
+    try:
+        yield
+    finally:
+        try:
+            sys.path.remove(caminho)
+        except ValueError:
+            pass
 
-class ToolVerificationInput(BaseModel):
-    """Entrada para a ferramenta de verificação."""
-    tool_path: str = Field(..., description="Caminho absoluto para o arquivo .py da ferramenta a ser verificada.")
-
-
-class _ToolAnalysisResult:
-    """Classe interna para armazenar os resultados da análise."""
-    def __init__(self, tool_path: Union[str, Path]):
-        self.tool_path = Path(tool_path)
-        self.errors: List[str] = []
-        self.warnings: List[str] = []
-        self.info: List[str] = []
-        self.tool_class_name: Optional[str] = None
-        self.tool_class: Optional[Type[BaseTool]] = None
-        self.ast_tree: Optional[ast.AST] = None
-        self.module: Optional[Any] = None
-        self.found_args_schema_name: Optional[str] = None
-        self.tool_instance: Optional[Any] = None
-        self.error_components: set[str] = set()
-
-    def add_error(self, message: str, component: str = None):
-        """Adiciona uma mensagem de erro com contexto do componente."""
-        if component:
-            self.error_components.add(component)
-            error_msg = f"ERRO NO COMPONENTE: {component}\n"
-            error_msg += "-" * 40 + "\n"
-            error_msg += f"Problema: {message}"
-            self.errors.append(error_msg)
-        else:
-            self.errors.append(f"ERRO: {message}")
-
-    def add_warning(self, message: str, component: str = None):
-        """Adiciona uma mensagem de aviso com contexto do componente."""
-        if component:
-            warning_msg = f"AVISO NO COMPONENTE: {component}\n"
-            warning_msg += "-" * 40 + "\n"
-            warning_msg += f"Atenção: {message}\n"
-            self.warnings.append(warning_msg)
-        else:
-            self.warnings.append(f"AVISO: {message}")
-
-    def add_info(self, message: str):
-        """Adiciona uma mensagem informativa (apenas para debug)."""
-        self.info.append(f"INFO: {message}")
-
-    def _format_report(self) -> str:
-        """Formata os resultados em um relatório textual.
-           Mantido para possível log interno, mas não será o retorno principal.
-        """
-        report_lines = [f"## Relatório de Verificação: {self.tool_path.name}"]
-
-        if not self.errors and not self.warnings:
-            status_header = "**Status: APROVADO (com ressalvas)**"
-            status_desc = ["   A verificação estática e de importação foi concluída sem erros ou avisos críticos.",
-                           "   A instanciação não foi testada ou falhou (ver avisos), mas a estrutura parece válida."]
-        elif not self.errors:
-            status_header = "**Status: APROVADO COM AVISOS**"
-            status_desc = ["   A ferramenta passou nas verificações essenciais, mas há avisos a serem considerados."]
-        else:
-            status_header = "**Status: FALHA**"
-            status_desc = ["   Foram encontrados erros críticos que impedem o uso seguro da ferramenta."]
 
-        report_lines.append(status_header)
-        report_lines.extend(status_desc)
+def _copiar_resultado(resultado: Dict[str, Any]) -> Dict[str, Any]:
+    """Copia o dicionário de resultados, incluindo as listas de mensagens."""
+    return {chave: list(valor) if isinstance(valor, list) else valor
+            for chave, valor in resultado.items()}
 
-        if self.tool_class_name:
-            report_lines.append(f"**Classe da Ferramenta Identificada:** `{self.tool_class_name}`")
-        else:
-            report_lines.append("**Classe da Ferramenta:** Nenhuma classe terminando com 'Tool' foi encontrada.")
-
-        if self.info:
-            report_lines.append("### Informações:")
-            report_lines.extend(self.info)
-
-        if self.warnings:
-            report_lines.append("### Avisos:")
-            report_lines.extend(self.warnings)
-
-        if self.errors:
-            report_lines.append("### Erros Críticos:")
-            report_lines.extend(self.errors)
-
-        report_lines.append("### Próximos Passos:")
-        if not self.errors:
-            report_lines.extend([
-                "- Revise os avisos (se houver).",
-                "- Realize testes funcionais da ferramenta com dados reais.",
-                "- Se a instanciação falhou (ver avisos), investigue possíveis problemas de inicialização ou dependências."
-            ])
-        else:
-            report_lines.extend([
-                "- Corrija os erros críticos listados.",
-                "- Execute a verificação novamente após as correções."
-            ])
 
-        return "\n".join(report_lines)
+class ToolVerificationInput(BaseModel):
+    """Entrada para a ferramenta de verificação."""
+    tool_path: str = Field(..., description="Caminho absoluto para o arquivo .py da ferramenta a ser verificada.")
 
 
 class ToolVerifierTool(BaseTool):
@@ -132,6 +118,8 @@ class ToolVerifierTool(BaseTool):
     )
     args_schema: Type[BaseModel] = ToolVerificationInput
     model_config = {'arbitrary_types_allowed': True}
+    # Quando verdadeiro, verifica apenas a AST, sem importar nem instanciar a ferramenta
+    static_only: bool = False
 
     # Método _run é obrigatório pela BaseTool
     def _run(self, tool_path: str) -> Dict[str, Any]:
@@ -158,231 +146,116 @@ class ToolVerifierTool(BaseTool):
         res.add_info(f"Iniciando verificação para: {res.tool_path}")
 
         # 1. Verificar existência do arquivo
-        if not res.tool_path.exists():
-            res.add_error(f"Arquivo não encontrado: {res.tool_path}")
-            return self._build_result_dict(res)
-        if not res.tool_path.is_file() or res.tool_path.suffix != '.py':
-            res.add_error(f"O caminho fornecido não é um arquivo .py válido: {res.tool_path}")
+        if not _checar_arquivo(res):
             return self._build_result_dict(res)
 
+        stat = res.tool_path.stat()
+        res.mtime_ns = stat.st_mtime_ns
+        res.file_size = stat.st_size
+        chave_cache = (str(res.tool_path.resolve()), stat.st_mtime_ns, stat.st_size,
+                       self.static_only)
+        resultado = _CACHE_VERIFICACOES.get(chave_cache)
+        if resultado is not None:
+            _CACHE_VERIFICACOES.move_to_end(chave_cache)
+            return _copiar_resultado(resultado)
+
+        resultado = self._verificar_arquivo(res)
+        if resultado["sucesso"]:
+            _CACHE_VERIFICACOES[chave_cache] = _copiar_resultado(resultado)
+            if len(_CACHE_VERIFICACOES) > _CACHE_VERIFICACOES_MAX:
+                _CACHE_VERIFICACOES.popitem(last=False)
+        return resultado
+
+    def run_many(self, paths: List[str], workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Verifica vários arquivos em paralelo, cada um em um processo separado.
+
+        As importações das ferramentas acontecem nos processos do pool e não
+        afetam o sys.modules do processo atual. Os resultados seguem a ordem
+        de 'paths'. 'workers' segue o padrão do ProcessPoolExecutor (número
+        de CPUs) quando omitido.
+        """
+        if not paths:
+            return []
+        # Importado só aqui: a verificação individual não usa o pool
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_inicializar_processo) as executor:
+            return list(executor.map(_verificar_em_processo, paths,
+                                     [self.static_only] * len(paths)))
+
+    def _verificar_arquivo(self, res: _ToolAnalysisResult) -> Dict[str, Any]:
+        """Executa as etapas de verificação de um arquivo .py existente."""
         # 2. Análise AST (Sintaxe e Estrutura Básica)
         if not self._verify_ast(res):
             return self._build_result_dict(res) # Erro crítico na AST impede continuação
 
-        # 3. Tentativa de Importação e Inspeção
-        self._verify_import_and_inspect(res)
-
-        # 4. Verificação da Instância (se a inspeção foi bem-sucedida)
-        if res.tool_class:
-            self._verify_instance(res)
-            # A verificação da instância adiciona erros/avisos, mas não interrompe o fluxo aqui
-            # pois queremos reportar todos os problemas encontrados.
-
-        # 5. Verificação do Args Schema (somente se a instância foi criada com sucesso)
-        if res.tool_instance:
-            self._verify_args_schema(res)
+        if self.static_only:
+            # Modo somente estático: atributos verificados apenas pela AST
+            self._verify_static_attributes(res)
+            res.add_info_const(_INFO_STATIC_ONLY)
         else:
-            # Adiciona aviso se a instância não pôde ser criada, impedindo a verificação do schema
-            res.add_warning("Verificação do args_schema pulada pois a instância da ferramenta não pôde ser criada.")
+            # 3. Tentativa de Importação e Inspeção
+            self._verify_import_and_inspect(res)
 
-        if not res.errors and not res.warnings:
-            res.add_info("Verificação concluída sem erros ou avisos críticos.")
-        elif not res.errors:
-            res.add_warning("Verificação concluída com avisos.")
-        else:
-            res.add_error("Verificação concluída com erros críticos.")
+            # 4. Verificação da Instância e do Args Schema (se a inspeção foi bem-sucedida)
+            if res.tool_class:
+                self._verify_instance(res)
+                # A verificação da instância adiciona erros/avisos, mas não interrompe o fluxo aqui
+                # pois queremos reportar todos os problemas encontrados.
+
+            if not res.tool_instance:
+                # Adiciona aviso se a instância não pôde ser criada, impedindo a verificação do schema
+                res.add_warning("Verificação do args_schema pulada pois a instância da ferramenta não pôde ser criada.")
 
-        res.add_info(f"Verificação finalizada para: {res.tool_path}")
+        _finalizar_verificacao(res)
 
         # Log interno (opcional)
         # print(res._format_report())
 
         return self._build_result_dict(res)
 
+    # Etapas estáticas: implementadas em _ast_core
     def _build_result_dict(self, res: _ToolAnalysisResult) -> Dict[str, Any]:
-        """Constrói o dicionário de resultados final."""
-        return {
-            "sucesso": not res.errors, # Sucesso significa sem erros críticos
-            "erros": res.errors,
-            "avisos": res.warnings,
-            "infos": res.info,
-            "tool_path": str(res.tool_path),
-            "tool_class_name": res.tool_class_name
-        }
+        return _build_result_dict(res)
 
     def _verify_ast(self, res: _ToolAnalysisResult) -> bool:
-        """Verifica erros de sintaxe e estrutura básica via AST."""
-        res.add_info("Analisando AST para erros de sintaxe e estrutura")
-        try:
-            source_code = res.tool_path.read_text(encoding='utf-8')
-            res.ast_tree = ast.parse(source_code)
-            res.add_info("Sintaxe do arquivo Python válida")
-        except SyntaxError as e:
-            # Extrair contexto do erro
-            linhas = source_code.split('\n')
-            inicio = max(0, e.lineno - 3)
-            fim = min(len(linhas), e.lineno + 2)
-            contexto = linhas[inicio:fim]
-            
-            # Identificar o componente com erro
-            componente = self._identificar_componente_com_erro(source_code, e.lineno)
-            
-            componente_nome, componente_descricao = componente
-            
-            # Mensagem de erro extremamente simplificada
-            parte1 = f"Erro de sintaxe na linha {e.lineno}: {e.msg}"
-            parte2 = f"Componente: {componente_nome}"
-            
-            # Criar mensagem em partes para evitar problemas de formatação
-            res.add_error(parte1)
-            res.add_error(parte2)
-            
-            # Adicionar contexto da linha com erro de forma segura
-            if contexto and 0 <= e.lineno - inicio - 1 < len(contexto):
-                linha_com_erro = contexto[e.lineno - inicio - 1].strip()
-                if len(linha_com_erro) > 30:  # Limitar o tamanho da linha
-                    linha_com_erro = linha_com_erro[:27] + "..."
-                res.add_error(f"Código: {linha_com_erro}")
-                
-                # Adicionar sugestão de correção com base no erro
-                if e.msg == "expected ':'":
-                    res.add_error("Sugestão: Adicione dois pontos (:) ao final da linha")
-                elif "unexpected EOF" in e.msg:
-                    res.add_error("Sugestão: Verifique parênteses/colchetes não fechados")
-                elif "unexpected indent" in e.msg:
-                    res.add_error("Sugestão: Corrija a indentação da linha")
-                else:
-                    res.add_error("Sugestão: Verifique a sintaxe Python na linha")
-            
-            return False
-        except Exception as e:
-            res.add_error(f"Erro ao ler ou parsear o arquivo: {e}\n{traceback.format_exc()}")
+        return _verify_ast(res)
+
+    def _identificar_componente_com_erro(self, linhas: List[str], linha_erro: int) -> tuple[str, str]:
+        return _identificar_componente_com_erro(linhas, linha_erro)
+
+    def _verify_static_attributes(self, res: _ToolAnalysisResult):
+        _verify_static_attributes(res)
+
+    def _importar_modulo(self, res: _ToolAnalysisResult, module_name: str, caminho: str) -> bool:
+        """Executa o módulo da ferramenta e o registra em sys.modules sob module_name."""
+        spec = importlib.util.spec_from_file_location(module_name, res.tool_path)
+        if spec is None or spec.loader is None:
+            res.add_error(f"Falha ao criar spec de importação para {res.tool_path.stem}.")
             return False
 
-        # Procurar classe da ferramenta na AST
-        found_tool_class_ast = False
-        for node in ast.walk(res.ast_tree):
-            if isinstance(node, ast.ClassDef) and node.name.endswith("Tool"):
-                res.tool_class_name = node.name
-                res.add_info(f"Classe AST encontrada: {node.name}")
-                found_tool_class_ast = True
-                
-                # Verificar herança básica
-                base_names = [b.id for b in node.bases if isinstance(b, ast.Name)]
-                if "BaseTool" not in base_names:
-                    res.add_warning(
-                        "AVISO DE HERANÇA\n" +
-                        "-" * 20 + "\n" +
-                        f"Classe: {node.name}\n" +
-                        "Problema: Não herda diretamente de 'BaseTool'\n" +
-                        "Ação: Verifique se a classe herda corretamente de 'BaseTool'\n" +
-                        "Exemplo:\n" +
-                        "class MinhaFerramenta(BaseTool):\n" +
-                        "    ..."
-                    )
-                else:
-                    res.add_info("Herança de BaseTool verificada na AST.")
-
-                # Verificar método _run
-                run_method = next((item for item in node.body if isinstance(item, ast.FunctionDef) and item.name == '_run'), None)
-                if not run_method:
-                    res.add_error(
-                        "ERRO NO MÉTODO _run\n" +
-                        "-" * 20 + "\n" +
-                        f"Classe: {node.name}\n" +
-                        "Problema: Método '_run' não encontrado\n" +
-                        "Ação: Adicione o método '_run' à classe\n" +
-                        "Exemplo:\n" +
-                        "    def _run(self, param1: str, param2: int = 0) -> dict:\n" +
-                        "        return {'resultado': 'processado'}"
-                    )
-                else:
-                    res.add_info("Método '_run' encontrado na AST.")
-
-                break
-
-        if not found_tool_class_ast:
-            res.add_error(
-                "ERRO NA ESTRUTURA DA CLASSE\n" +
-                "-" * 20 + "\n" +
-                "Problema: Nenhuma classe terminando com 'Tool' foi encontrada\n" +
-                "Ação: Crie uma classe que herde de BaseTool e termine com 'Tool'\n" +
-                "Exemplo:\n" +
-                "class MinhaFerramenta(BaseTool):\n" +
-                "    name = 'Minha Ferramenta'\n" +
-                "    description = 'Descrição da ferramenta'"
-            )
+        res.module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = res.module
+        # Isolar a execução do módulo para evitar poluir o namespace principal
+        # e capturar exceções durante a execução do código no nível do módulo.
+        # O diretório pai fica no sys.path só durante a execução (imports relativos).
+        try:
+            with _syspath_prepend(str(res.tool_path.parent.resolve())):
+                spec.loader.exec_module(res.module)
+            res.add_info_const(_INFO_MODULO_IMPORTADO)
+        except Exception as e_exec:
+            sys.modules.pop(module_name, None)
+            res.add_error(f"Erro durante a execução do código do módulo (nível superior): {_formatar_excecao(e_exec)}")
+            # Não prosseguir com a inspeção se o módulo falhou ao carregar
             return False
 
+        # Descartar a versão anterior do mesmo arquivo, se houver
+        anterior = _MODULOS_VERIFICADOS.get(caminho)
+        if anterior is not None and anterior != module_name:
+            sys.modules.pop(anterior, None)
+        _MODULOS_VERIFICADOS[caminho] = module_name
         return True
 
-    def _identificar_componente_com_erro(self, source_code: str, linha_erro: int) -> tuple[str, str]:
-        """Identifica em qual componente da ferramenta o erro ocorreu.
-        
-        Args:
-            source_code: Código fonte completo do arquivo
-            linha_erro: Número da linha onde o erro ocorreu
-            
-        Returns:
-            Tupla com (nome do componente, parâmetro do DynamicToolCreator)
-            Ex: ('Método _run', 'implementation')
-        """
-        # Mapeamento de componentes para parâmetros do DynamicToolCreator
-        MAPEAMENTO_COMPONENTES = {
-            'Método _run': 'implementação do método _run',
-            'Atributos da Classe': 'definição dos atributos da classe',
-            'Schema de Entrada': 'definição dos parâmetros',
-            'Herança de Classe': 'estrutura da classe',
-            'Estrutura Python': 'sintaxe Python',
-            'Imports': 'importações',
-            'Métodos Customizados': 'métodos personalizados'
-        }
-        
-        linhas = source_code.split('\n')
-        linha_atual = linha_erro - 1  # 0-based index
-        
-        # Procura por padrões comuns acima da linha de erro
-        linha_atual_str = linhas[linha_atual].strip()
-        componente = None
-        
-        # Verifica componentes comuns
-        if '_run' in ''.join(linhas[max(0, linha_atual-5):min(len(linhas), linha_atual+5)]):
-            componente = 'Método _run'
-        elif 'class' in linha_atual_str and ('Tool' in linha_atual_str or 'BaseTool' in linha_atual_str):
-            componente = 'Herança de Classe'
-        elif 'BaseModel' in linha_atual_str or any('Field(' in linha for linha in linhas[max(0, linha_atual-5):min(len(linhas), linha_atual+5)]):
-            componente = 'Schema de Entrada'
-        elif any(attr in linha_atual_str for attr in ['name', 'description', 'args_schema']):
-            componente = 'Atributos da Classe'
-        elif 'import' in linha_atual_str.lower() or 'from' in linha_atual_str.lower():
-            componente = 'Imports'
-        elif 'def' in linha_atual_str and '_run' not in linha_atual_str:
-            componente = 'Métodos Customizados'
-        else:
-            componente = 'Estrutura Python'
-        
-        return (componente, MAPEAMENTO_COMPONENTES[componente])
-
-    def _check_for_class_attributes(self, node: ast.ClassDef, res: _ToolAnalysisResult):
-        """Verifica a presença de atributos de classe (name, description, args_schema) via AST."""
-        required_attrs = {'name': False, 'description': False, 'args_schema': False}
-        for item in node.body:
-            if isinstance(item, ast.AnnAssign):
-                if isinstance(item.target, ast.Name) and item.target.id in required_attrs:
-                    required_attrs[item.target.id] = True
-            elif isinstance(item, ast.Assign):
-                for target in item.targets:
-                    if isinstance(target, ast.Name) and target.id in required_attrs:
-                        required_attrs[target.id] = True
-
-        # Reportar atributos ausentes
-        for attr, found in required_attrs.items():
-            if not found:
-                # Aviso em vez de erro, pois a verificação na instância é mais confiável
-                res.add_warning(f"Atributo de classe '{attr}' não detectado estaticamente via AST. Será verificado na instância.")
-            else:
-                res.add_info(f"Atributo de classe '{attr}' encontrado na AST.")
-
     def _verify_import_and_inspect(self, res: _ToolAnalysisResult):
         """Tenta importar o módulo e inspecionar a classe."""
         if not res.tool_class_name: # Se a AST não encontrou, não tenta importar
@@ -391,73 +264,44 @@ class ToolVerifierTool(BaseTool):
 
         res.add_info(f"Tentando importar dinamicamente o módulo: {res.tool_path.stem}")
         try:
-            module_name = res.tool_path.stem
-            spec = importlib.util.spec_from_file_location(module_name, res.tool_path)
-            if spec is None or spec.loader is None:
-                res.add_error(f"Falha ao criar spec de importação para {module_name}.")
+            caminho = str(res.tool_path.resolve())
+            module_name = _nome_modulo_em_cache(caminho, res.mtime_ns, res.file_size)
+            res.module = sys.modules.get(module_name)
+            if res.module is not None:
+                res.add_info_const(_INFO_MODULO_REUTILIZADO)
+            elif not self._importar_modulo(res, module_name, caminho):
                 return
 
-            res.module = importlib.util.module_from_spec(spec)
-            # Adicionar diretório pai ao sys.path temporariamente pode ajudar com imports relativos
-            original_sys_path = sys.path[:]
-            parent_dir = str(res.tool_path.parent.resolve())
-            if parent_dir not in sys.path:
-                sys.path.insert(0, parent_dir)
+            # Inspecionar o módulo carregado: o nome da classe já é conhecido pela AST
+            name = res.tool_class_name
+            obj = getattr(res.module, name, None)
+            if inspect.isclass(obj) and issubclass(obj, BaseTool):
+                res.add_info(f"Encontrada classe '{name}' herdando de BaseTool.")
+                res.tool_class = obj # Armazena a classe encontrada
 
-            # Isolar a execução do módulo para evitar poluir o namespace principal
-            # e capturar exceções durante a execução do código no nível do módulo
-            try:
-                spec.loader.exec_module(res.module)
-                res.add_info("Módulo importado com sucesso.")
-            except Exception as e_exec:
-                res.add_error(f"Erro durante a execução do código do módulo (nível superior): {e_exec}\n{traceback.format_exc()}")
-                # Não prosseguir com a inspeção se o módulo falhou ao carregar
-                if parent_dir in sys.path:
-                    sys.path.remove(parent_dir) # Limpa o sys.path modificado
-                return
-            finally:
-                # Restaurar sys.path se foi modificado
-                if parent_dir in sys.path and parent_dir not in original_sys_path:
-                    sys.path.remove(parent_dir)
-
-
-            # Inspecionar o módulo carregado
-            found_class_in_module = False
-            for name, obj in inspect.getmembers(res.module):
-                if name == res.tool_class_name and inspect.isclass(obj):
-                    if not issubclass(obj, BaseTool):
-                        continue
-
-                    res.add_info(f"Encontrada classe '{name}' herdando de BaseTool.")
-                    found_class_in_module = True
-                    res.tool_class = obj # Armazena a classe encontrada
-
-                    # Verificar se _run existe e é callable
-                    if not hasattr(obj, "_run") or not callable(getattr(obj, "_run")):
-                        res.add_error(f"Método '_run' não encontrado ou não é chamável na classe '{name}' carregada.")
-                    else:
-                        res.add_info("Método '_run' encontrado e chamável via inspeção.")
-
-                    break # Encontrou a classe esperada
-
-            if not found_class_in_module:
+                # Verificar se _run existe e é callable
+                if not hasattr(obj, "_run") or not callable(getattr(obj, "_run")):
+                    res.add_error(f"Método '_run' não encontrado ou não é chamável na classe '{name}' carregada.")
+                else:
+                    res.add_info_const(_INFO_RUN_INSPECAO_OK)
+            else:
                 res.add_error(f"Classe '{res.tool_class_name}' (encontrada na AST) não foi encontrada no módulo importado.")
 
         except ImportError as e:
-            res.add_error(f"Erro de importação ao carregar o módulo ou suas dependências: {e}\n{traceback.format_exc()}")
+            res.add_error(f"Erro de importação ao carregar o módulo ou suas dependências: {_formatar_excecao(e)}")
         except Exception as e:
-            res.add_error(f"Erro inesperado durante a importação ou inspeção: {e}\n{traceback.format_exc()}")
+            res.add_error(f"Erro inesperado durante a importação ou inspeção: {_formatar_excecao(e)}")
 
     def _verify_instance(self, res: _ToolAnalysisResult):
         """Tenta instanciar a ferramenta, tratando erros comuns como avisos."""
         if not res.tool_class: # Não tenta se a classe não foi carregada
-            res.add_info("Instanciação pulada devido a classe não carregada.")
+            res.add_info_const(_INFO_INSTANCIACAO_PULADA)
             return
 
         res.add_info(f"Tentando instanciar '{res.tool_class_name}'...")
         try:
             instance = res.tool_class()
-            res.add_info("Instanciação da ferramenta bem-sucedida.")
+            res.add_info_const(_INFO_INSTANCIA_OK)
             res.tool_instance = instance # Armazena a instância
 
             # Verificar atributos na instância
@@ -469,46 +313,44 @@ class ToolVerifierTool(BaseTool):
             if not hasattr(instance, "description") or not isinstance(getattr(instance, "description", None), str):
                 res.add_error(f"Atributo 'description' (string) não encontrado na INSTÂNCIA de '{res.tool_class_name}'.")
             else:
-                res.add_info("Atributo 'description' encontrado na instância.") # Não logar a descrição inteira
+                res.add_info_const(_INFO_DESCRIPTION_OK) # Não logar a descrição inteira
 
             if not hasattr(instance, "args_schema"):
                 res.add_error("Atributo 'args_schema' não encontrado na instância da ferramenta.")
             elif not inspect.isclass(instance.args_schema) or not issubclass(instance.args_schema, BaseModel):
                 res.add_error(f"Atributo 'args_schema' na INSTÂNCIA de '{res.tool_class_name}' não é uma subclasse de pydantic.BaseModel.")
             else:
-                res.add_info(f"Atributo 'args_schema' encontrado na instância: {instance.args_schema.__name__}.")
+                args_schema = instance.args_schema
+                res.add_info(f"Atributo 'args_schema' encontrado na instância: {args_schema.__name__}.")
+
+                # Com o tipo já validado acima, verifica o próprio Pydantic Model
+                res.add_info(f"Verificando a validade do Pydantic Model: {args_schema.__name__}")
+                try:
+                    # Tenta obter o schema JSON para verificar se é um modelo Pydantic válido
+                    schema = _json_schema(args_schema)
+                    if not schema or 'properties' not in schema:
+                        # Considerar se um schema sem propriedades é um erro ou aviso. Por ora, aviso.
+                        res.add_warning(f"O schema Pydantic '{args_schema.__name__}' parece vazio ou inválido (sem propriedades definidas).")
+                    else:
+                        res.add_info(f"Schema Pydantic '{args_schema.__name__}' parece válido.")
+                except Exception as e:
+                    res.add_error(f"Erro ao validar o Pydantic Model '{args_schema.__name__}': {_formatar_excecao(e)}")
 
         except Exception as e:
             # Captura erros durante a instanciação (ex: __init__ faltando args, etc.)
-            res.add_error(f"Falha na instanciação: {e}\n{traceback.format_exc()}")
+            res.add_error(f"Falha na instanciação: {_formatar_excecao(e)}")
 
-    def _verify_args_schema(self, res: _ToolAnalysisResult):
-        """Verifica se o args_schema na INSTÂNCIA é um Pydantic Model válido."""
-        # Esta verificação agora depende da INSTÂNCIA ter sido criada com sucesso.
-        # A checagem se 'res.tool_instance' existe é feita ANTES de chamar este método.
-        # A checagem se 'args_schema' existe na instância já foi feita por _verify_instance.
 
-        args_schema = getattr(res.tool_instance, 'args_schema', None) # Pega da instância
+def _inicializar_processo():
+    """Importa as dependências pesadas uma vez por processo do pool."""
+    import crewai.tools  # noqa: F401
+    import pydantic  # noqa: F401
 
-        # Se chegou aqui, a instância existe. Verificamos se args_schema é um tipo BaseModel válido.
-        if not args_schema or not isinstance(args_schema, type) or not issubclass(args_schema, BaseModel):
-             # O erro já deve ter sido adicionado por _verify_instance se o atributo estava ausente ou do tipo errado.
-             # Adicionamos um aviso aqui caso algo muito estranho tenha acontecido.
-             if not any("args_schema" in error for error in res.errors): # Evita duplicar erros
-                res.add_warning(f"Atributo 'args_schema' na instância é inesperadamente inválido (type={type(args_schema)}) apesar de ter passado na verificação inicial.")
-             return
 
-        res.add_info(f"Verificando a validade do Pydantic Model: {args_schema.__name__}")
-        try:
-            # Tenta obter o schema JSON para verificar se é um modelo Pydantic válido
-            schema = args_schema.model_json_schema()
-            if not schema or 'properties' not in schema:
-                # Considerar se um schema sem propriedades é um erro ou aviso. Por ora, aviso.
-                res.add_warning(f"O schema Pydantic '{args_schema.__name__}' parece vazio ou inválido (sem propriedades definidas).")
-            else:
-                res.add_info(f"Schema Pydantic '{args_schema.__name__}' parece válido.")
-        except Exception as e:
-            res.add_error(f"Erro ao validar o Pydantic Model '{args_schema.__name__}': {e}\n{traceback.format_exc()}")
+def _verificar_em_processo(tool_path: str, static_only: bool) -> Dict[str, Any]:
+    """Executa a verificação de um arquivo dentro de um processo do pool."""
+    return ToolVerifierTool(static_only=static_only).run(tool_path=tool_path)
+
 
 # Bloco para execução direta do verificador
 if __name__ == "__main__":
@@ -1,20 +1,247 @@
 #!/usr/bin/env python
+import functools
+import hashlib
+import json
 import os
 import sys
-from crewai import Agent, Task, Crew, Process
-from crewai.project import CrewBase, agent, crew, task
+import tempfile
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Optional
+from crewai import Agent, Task, Crew, Process, LLM
+from crewai.project import CrewBase, agent, before_kickoff, crew, task
+from crewai.tasks.task_output import TaskOutput
 from dotenv import load_dotenv
 
+try:
+    from crewai.events import crewai_event_bus, LLMStreamChunkEvent
+except ImportError:  # versões anteriores do crewai
+    from crewai.utilities.events import crewai_event_bus, LLMStreamChunkEvent
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Add project root directory to sys.path
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
-sys.path.append(project_root)
+if project_root not in sys.path:
+    sys.path.append(project_root)
 
 # Load environment variables
 load_dotenv()
 
+# Logs detalhados e o planejamento do CrewAI (uma chamada extra ao LLM antes
+# das tarefas) ficam desligados por padrão; ative com PDCA_VERBOSE=1 / PDCA_PLANNING=1
+_VERBOSE = os.getenv("PDCA_VERBOSE", "0") == "1"
+_PLANNING = os.getenv("PDCA_PLANNING", "0") == "1"
+
+# PDCA_VERIFICAR_CACHE=0 força uma verificação nova: ignora o cache de
+# resultados e as saídas de tarefas já gravadas em disco
+_CACHE_HABILITADO = os.getenv("PDCA_VERIFICAR_CACHE", "1") == "1"
+
 # Importar o modelo Pydantic para o resultado da verificação
 from crews.pdca.pdca_models import ResultadoVerificacao
 
+def modelo_verificar() -> str:
+    """Modelo usado pelos agentes da equipe de verificação (PDCA_VERIFICAR_LLM)."""
+    return os.getenv("PDCA_VERIFICAR_LLM", "azure/gpt-4o-mini")
+
+
+@functools.cache
+def llm_verificar() -> LLM:
+    """
+    LLM compartilhado pelos seis agentes, criado no primeiro uso.
+
+    Uma só instância reaproveita o cliente HTTP e o cache de prompts do provedor;
+    timeout e max_retries evitam que uma chamada presa ou um 429 derrube a equipe.
+    O modelo pode ser trocado com PDCA_VERIFICAR_LLM.
+    """
+    return LLM(
+        model=modelo_verificar(),
+        timeout=60,
+        max_retries=5,
+        stream=True
+    )
+
+# Diretório dos arquivos gerados pela equipe; criado uma única vez em crew()
+DIRETORIO_RESULTADOS = Path("crews/pdca/resultados/verificar")
+
+# Resultados de verificações já concluídas, um arquivo JSON por conjunto de entradas
+DIRETORIO_CACHE = DIRETORIO_RESULTADOS / ".cache"
+
+
+DIRETORIO_CONFIG = Path(__file__).parent / "config"
+
+
+@functools.cache
+def _versao_configuracao() -> bytes:
+    """Digest do que, além das entradas, determina o resultado: prompts dos
+    agentes e tarefas e o esquema de ResultadoVerificacao."""
+    digest = hashlib.blake2b(digest_size=16)
+    for nome in ("agents.yaml", "tasks.yaml"):
+        digest.update((DIRETORIO_CONFIG / nome).read_bytes())
+    esquema = json.dumps(ResultadoVerificacao.model_json_schema(), sort_keys=True)
+    digest.update(esquema.encode("utf-8"))
+    return digest.digest()
+
+
+def hash_entradas(inputs: dict) -> str:
+    """Hash das entradas da equipe (forma canônica em JSON), do modelo e da configuração."""
+    canonico = json.dumps(inputs, sort_keys=True, ensure_ascii=False, default=str)
+    digest = hashlib.blake2b(canonico.encode("utf-8"), digest_size=16)
+    digest.update(modelo_verificar().encode("utf-8"))
+    digest.update(_versao_configuracao())
+    return digest.hexdigest()
+
+
+def caminho_cache(inputs: dict) -> str:
+    """Arquivo de cache correspondente às entradas."""
+    return str(DIRETORIO_CACHE / f"{hash_entradas(inputs)}.json")
+
+
+def serializar_resultado(resultado: ResultadoVerificacao) -> bytes:
+    """Serializa o resultado em JSON (UTF-8, indentado), via orjson quando disponível."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(resultado.model_dump(), default=str, option=orjson.OPT_INDENT_2)
+    return resultado.model_dump_json(indent=2).encode("utf-8")
+
+
+def _gravar_relatorio(saida):
+    """Callback da síntese: grava o relatório estruturado em relatorio_verificacao.json."""
+    if saida.pydantic is not None:
+        conteudo = serializar_resultado(saida.pydantic)
+    else:
+        # Conversão para ResultadoVerificacao falhou: grava a saída bruta para diagnóstico
+        conteudo = saida.raw.encode("utf-8")
+    with open(DIRETORIO_RESULTADOS / "relatorio_verificacao.json", "wb") as arquivo:
+        arquivo.write(conteudo)
+
+
+# Tarefas de texto cujo andamento é gravado em '<tarefa>.parcial.txt' à medida
+# que o LLM gera a resposta; o arquivo é removido quando o output_file é gravado.
+# A síntese fica de fora: seu JSON só é útil inteiro, depois de validado pelo Pydantic.
+TAREFAS_COM_STREAMING = frozenset({
+    "analisar_dados_task",
+    "comparar_resultados_metas_task",
+    "identificar_analisar_desvios_task",
+    "avaliar_eficacia_acoes_task",
+    "criar_visualizacoes_task",
+})
+
+# Chamada ao LLM (call_id) que está sendo gravada no arquivo parcial de cada tarefa
+_chamada_por_parcial: dict = {}
+
+
+def _caminho_parcial(tarefa: str) -> Path:
+    return DIRETORIO_RESULTADOS / f"{tarefa}.parcial.txt"
+
+
+def _gravar_trecho(source, event):
+    """Acrescenta um trecho do streaming ao arquivo parcial da tarefa."""
+    tarefa = getattr(event, "task_name", None)
+    if tarefa not in TAREFAS_COM_STREAMING:
+        return
+    # Uma nova chamada (nova tentativa ou iteração do agente) recomeça o arquivo
+    chamada = getattr(event, "call_id", None)
+    if tarefa in _chamada_por_parcial and _chamada_por_parcial[tarefa] == chamada:
+        modo = "a"
+    else:
+        modo = "w"
+        _chamada_por_parcial[tarefa] = chamada
+    with open(_caminho_parcial(tarefa), modo, encoding="utf-8") as arquivo:
+        arquivo.write(event.chunk)
+
+
+def _descartar_parcial(tarefa: str):
+    """Remove o arquivo parcial da tarefa, substituído pelo output_file."""
+    _chamada_por_parcial.pop(tarefa, None)
+    _caminho_parcial(tarefa).unlink(missing_ok=True)
+
+
+@functools.cache
+def _registrar_streaming():
+    """Registra o gravador de trechos no barramento de eventos (uma única vez)."""
+    crewai_event_bus.on(LLMStreamChunkEvent)(_gravar_trecho)
+
+
+class TarefaRetomavel(Task):
+    """
+    Tarefa que reaproveita o output_file de uma execução anterior.
+
+    Ao concluir, grava ao lado do output_file um arquivo '.hash' com a chave da
+    execução (hash_entradas); antes de executar, remove o '.hash' anterior. Se a equipe for executada de novo com as mesmas
+    entradas (ex.: após uma falha numa tarefa posterior), a tarefa devolve o
+    conteúdo do arquivo sem chamar o LLM.
+    """
+
+    chave_execucao: Optional[str] = None
+
+    def _caminho_hash(self) -> str:
+        return f"{self.output_file}.hash"
+
+    def _saida_anterior(self) -> Optional[TaskOutput]:
+        """Saída gravada para as mesmas entradas, ou None se não houver."""
+        if self.chave_execucao is None or not self.output_file:
+            return None
+        try:
+            with open(self._caminho_hash(), encoding="utf-8") as arquivo:
+                if arquivo.read() != self.chave_execucao:
+                    return None
+            with open(self.output_file, encoding="utf-8") as arquivo:
+                bruto = arquivo.read()
+        except OSError:
+            return None
+        self.output = TaskOutput(
+            description=self.description,
+            name=self.name,
+            expected_output=self.expected_output,
+            raw=bruto,
+            agent=self.agent.role if self.agent else ""
+        )
+        return self.output
+
+    def _descartar_hash(self):
+        """Remove o '.hash': a partir daqui o output_file será reescrito."""
+        if self.output_file:
+            Path(self._caminho_hash()).unlink(missing_ok=True)
+
+    def _concluir(self):
+        """Após a execução: grava o '.hash' e descarta o arquivo parcial do streaming."""
+        if self.chave_execucao is not None and self.output_file:
+            with open(self._caminho_hash(), "w", encoding="utf-8") as arquivo:
+                arquivo.write(self.chave_execucao)
+        _descartar_parcial(self.name)
+
+    def execute_sync(self, agent=None, context=None, tools=None) -> TaskOutput:
+        saida = self._saida_anterior()
+        if saida is None:
+            self._descartar_hash()
+            saida = super().execute_sync(agent, context, tools)
+            self._concluir()
+        return saida
+
+    def execute_async(self, agent=None, context=None, tools=None) -> Future:
+        saida = self._saida_anterior()
+        if saida is not None:
+            futuro = Future()
+            futuro.set_result(saida)
+            return futuro
+        self._descartar_hash()
+        futuro = super().execute_async(agent, context, tools)
+        futuro.add_done_callback(lambda f: f.exception() is None and self._concluir())
+        return futuro
+
+    async def aexecute_sync(self, agent=None, context=None, tools=None) -> TaskOutput:
+        saida = self._saida_anterior()
+        if saida is None:
+            self._descartar_hash()
+            saida = await super().aexecute_sync(agent, context, tools)
+            self._concluir()
+        return saida
+
 @CrewBase
 class VerificarCrew:
     """
@@ -25,13 +252,19 @@ class VerificarCrew:
     e avaliando a eficácia das ações implementadas.
     """
 
+    # As tarefas de verificação não usam ferramentas e raramente precisam de
+    # mais de uma iteração: max_iter, max_execution_time (segundos) e
+    # max_retry_limit limitam o custo de um agente que entre em laço.
     @agent
     def analista_dados(self) -> Agent:
         """Especialista em análise de dados coletados"""
         return Agent(
             config=self.agents_config['analista_dados'],
-            verbose=True,
-            llm="azure/gpt-4o-mini"
+            verbose=_VERBOSE,
+            llm=llm_verificar(),
+            max_iter=3,
+            max_execution_time=120,
+            max_retry_limit=2
         )
     
     @agent
@@ -39,8 +272,11 @@ class VerificarCrew:
         """Especialista em avaliação de resultados versus metas"""
         return Agent(
             config=self.agents_config['avaliador_resultados'],
-            verbose=True,
-            llm="azure/gpt-4o-mini"
+            verbose=_VERBOSE,
+            llm=llm_verificar(),
+            max_iter=3,
+            max_execution_time=120,
+            max_retry_limit=2
         )
     
     @agent
@@ -48,8 +284,11 @@ class VerificarCrew:
         """Especialista em identificação e análise de desvios"""
         return Agent(
             config=self.agents_config['analista_desvios'],
-            verbose=True,
-            llm="azure/gpt-4o-mini"
+            verbose=_VERBOSE,
+            llm=llm_verificar(),
+            max_iter=3,
+            max_execution_time=120,
+            max_retry_limit=2
         )
     
     @agent
@@ -57,8 +296,11 @@ class VerificarCrew:
         """Especialista em avaliação da eficácia das ações implementadas"""
         return Agent(
             config=self.agents_config['avaliador_eficacia'],
-            verbose=True,
-            llm="azure/gpt-4o-mini"
+            verbose=_VERBOSE,
+            llm=llm_verificar(),
+            max_iter=3,
+            max_execution_time=120,
+            max_retry_limit=2
         )
     
     @agent
@@ -66,8 +308,11 @@ class VerificarCrew:
         """Especialista em visualização e comunicação de resultados"""
         return Agent(
             config=self.agents_config['visualizador_dados'],
-            verbose=True,
-            llm="azure/gpt-4o-mini"
+            verbose=_VERBOSE,
+            llm=llm_verificar(),
+            max_iter=3,
+            max_execution_time=120,
+            max_retry_limit=2
         )
     
     @agent
@@ -75,57 +320,66 @@ class VerificarCrew:
         """Especialista em síntese e integração da verificação completa"""
         return Agent(
             config=self.agents_config['sintetizador_verificacao'],
-            verbose=True,
-            llm="azure/gpt-4o-mini"
+            verbose=_VERBOSE,
+            llm=llm_verificar(),
+            max_iter=3,
+            max_execution_time=120,
+            max_retry_limit=2
         )
 
+    # Os decoradores @agent e @task do CrewBase já memorizam o retorno: as
+    # chamadas repetidas nos 'context' abaixo devolvem a mesma instância de
+    # Task/Agent, sem reconstruí-la nem reler a configuração.
     @task
     def analisar_dados_task(self) -> Task:
         """Tarefa de análise dos dados coletados"""
-        return Task(
+        return TarefaRetomavel(
             config=self.tasks_config['analisar_dados_task'],
             agent=self.analista_dados(),
-            output_file="crews/pdca/resultados/verificar/analise_dados.txt",
-            create_directory=True
+            output_file=str(DIRETORIO_RESULTADOS / "analise_dados.txt"),
+            create_directory=False
         )
 
     @task
     def comparar_resultados_metas_task(self) -> Task:
         """Tarefa de comparação dos resultados com as metas estabelecidas"""
-        return Task(
+        return TarefaRetomavel(
             config=self.tasks_config['comparar_resultados_metas_task'],
             agent=self.avaliador_resultados(),
             context=[self.analisar_dados_task()],
-            output_file="crews/pdca/resultados/verificar/comparacao_resultados_metas.txt",
-            create_directory=True
+            output_file=str(DIRETORIO_RESULTADOS / "comparacao_resultados_metas.txt"),
+            create_directory=False
         )
 
     @task
     def identificar_analisar_desvios_task(self) -> Task:
         """Tarefa de identificação e análise de desvios"""
-        return Task(
+        return TarefaRetomavel(
             config=self.tasks_config['identificar_analisar_desvios_task'],
             agent=self.analista_desvios(),
             context=[self.comparar_resultados_metas_task()],
-            output_file="crews/pdca/resultados/verificar/analise_desvios.txt",
-            create_directory=True
+            output_file=str(DIRETORIO_RESULTADOS / "analise_desvios.txt"),
+            create_directory=False
         )
 
     @task
     def avaliar_eficacia_acoes_task(self) -> Task:
         """Tarefa de avaliação da eficácia das ações implementadas"""
-        return Task(
+        return TarefaRetomavel(
             config=self.tasks_config['avaliar_eficacia_acoes_task'],
             agent=self.avaliador_eficacia(),
             context=[self.identificar_analisar_desvios_task()],
-            output_file="crews/pdca/resultados/verificar/avaliacao_eficacia.txt",
-            create_directory=True
+            output_file=str(DIRETORIO_RESULTADOS / "avaliacao_eficacia.txt"),
+            create_directory=False,
+            # Independente das visualizações: as duas rodam em paralelo e a
+            # síntese aguarda ambas
+            async_execution=True
         )
 
     @task
     def criar_visualizacoes_task(self) -> Task:
         """Tarefa de criação de visualizações dos resultados"""
-        return Task(
+        return TarefaRetomavel(
             config=self.tasks_config['criar_visualizacoes_task'],
             agent=self.visualizador_dados(),
             context=[
@@ -133,8 +387,9 @@ class VerificarCrew:
                 self.comparar_resultados_metas_task(),
                 self.identificar_analisar_desvios_task()
             ],
-            output_file="crews/pdca/resultados/verificar/visualizacoes_resultados.txt",
-            create_directory=True
+            output_file=str(DIRETORIO_RESULTADOS / "visualizacoes_resultados.txt"),
+            create_directory=False,
+            async_execution=True
         )
 
     @task
@@ -150,26 +405,84 @@ class VerificarCrew:
                 self.avaliar_eficacia_acoes_task(),
                 self.criar_visualizacoes_task()
             ],
-            output_file="crews/pdca/resultados/verificar/relatorio_verificacao.json",
+            # Sem output_file: o relatório é gravado por _gravar_relatorio,
+            # que serializa com orjson em vez do model_dump_json do CrewAI
             output_pydantic=ResultadoVerificacao,
-            create_directory=True
+            callback=_gravar_relatorio
         )
 
+    # Desligado por verificar(usar_cache=False) ou PDCA_VERIFICAR_CACHE=0
+    _usar_cache = _CACHE_HABILITADO
+
+    @before_kickoff
+    def _marcar_entradas(self, inputs: dict) -> dict:
+        """Informa às tarefas retomáveis a chave desta execução (None desativa a retomada)."""
+        chave = hash_entradas(inputs or {}) if self._usar_cache else None
+        for tarefa in self.tasks:
+            if isinstance(tarefa, TarefaRetomavel):
+                tarefa.chave_execucao = chave
+        return inputs
+
+    def verificar(self, inputs: dict, usar_cache: bool = True) -> ResultadoVerificacao:
+        """
+        Executa a verificação e retorna o resultado estruturado.
+
+        Entradas idênticas a uma verificação anterior (com o mesmo modelo e a
+        mesma configuração) reaproveitam o resultado gravado em DIRETORIO_CACHE,
+        sem nenhuma chamada ao LLM. PDCA_VERIFICAR_CACHE=0 desativa o cache.
+        """
+        usar_cache = usar_cache and _CACHE_HABILITADO
+        self._usar_cache = usar_cache
+        caminho = caminho_cache(inputs)
+        if usar_cache:
+            try:
+                with open(caminho, encoding="utf-8") as arquivo:
+                    return ResultadoVerificacao.model_validate_json(arquivo.read())
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError):
+                # Entrada ilegível ou truncada (ValidationError é um ValueError):
+                # descarta e refaz a verificação
+                Path(caminho).unlink(missing_ok=True)
+
+        resultado = self.crew().kickoff(inputs=inputs).pydantic
+        if usar_cache and resultado is not None:
+            DIRETORIO_CACHE.mkdir(parents=True, exist_ok=True)
+            # Grava num temporário e substitui: o cache nunca fica com um arquivo pela metade
+            fd, temporario = tempfile.mkstemp(dir=DIRETORIO_CACHE, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as arquivo:
+                    arquivo.write(serializar_resultado(resultado))
+                os.replace(temporario, caminho)
+            finally:
+                Path(temporario).unlink(missing_ok=True)
+        return resultado
+
     @crew
     def crew(self) -> Crew:
         """Executa a equipe de verificação PDCA"""
+        # Dependências entre as tarefas (via 'context'):
+        #   analisar -> comparar -> identificar -> {avaliar, visualizar} -> sintetizar
+        # O caminho crítico é linear até 'identificar'; o único ramo
+        # independente (avaliar/visualizar) já roda em paralelo com
+        # async_execution, então o processo sequencial não serializa nada a mais.
+        DIRETORIO_RESULTADOS.mkdir(parents=True, exist_ok=True)
+        _registrar_streaming()
+        _chamada_por_parcial.clear()
         crew = Crew(
             name="Equipe de Verificação PDCA",
             agents=self.agents,
             tasks=self.tasks,
             process=Process.sequential,
-            verbose=True,
-            planning=True,
-            output_log_file="crews/pdca/resultados/verificar/verificar_crew_log.txt"
+            verbose=_VERBOSE,
+            planning=_PLANNING,
+            output_log_file=str(DIRETORIO_RESULTADOS / "verificar_crew_log.txt")
         )
         return crew
 
 if __name__ == "__main__":
+    import asyncio
+
     # Exemplo de uso da equipe
     crew = VerificarCrew()
     
@@ -192,12 +505,19 @@ if __name__ == "__main__":
     }
     
     # Inputs no formato esperado pelo PDCAFlow
-    resultados = crew.crew().kickoff(inputs={
+    inputs = {
         "plano_acao": plano_acao,
         "resultado_execucao": resultado_execucao,
         "objetivo": "CRM de clientes, com emissao de boletos e envios de mensagens via WhatsApp",
         "metricas": "Taxa de utilização do CRM: Proporção de usuários que utilizam o CRM após implementação - Meta: 75 por cento"
-    })
+    }
+
+    async def main():
+        # kickoff_async permite compor a verificação com outras corrotinas,
+        # ex.: asyncio.gather(planejar.kickoff_async(...), verificar.kickoff_async(...))
+        return await crew.crew().kickoff_async(inputs=inputs)
+
+    resultados = asyncio.run(main())
     
     print("Resultado da verificação:")
     print(f"Tipo de resultado: {type(resultados)}")